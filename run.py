@@ -2,27 +2,30 @@ import os
 import sys
 import subprocess
 import time
+from importlib.util import find_spec
 
 def print_step(message):
     print(f"[*] {message}")
 
 def check_dependencies():
     print_step("Checking dependencies...")
-    try:
-        import streamlit
-        import pandas
-        import rich
-        import stix2
-        print_step("All dependencies found.")
-        return True
-    except ImportError as e:
-        print(f"[!] Missing dependency: {e.name}")
+    # find_spec only locates the packages; importing them here would pay their full init cost
+    missing = [name for name in ("streamlit", "pandas", "rich", "orjson") if find_spec(name) is None]
+    if missing:
+        print(f"[!] Missing dependencies: {', '.join(missing)}")
         return False
+    print_step("All dependencies found.")
+    return True
 
 def install_dependencies():
     print_step("Installing dependencies from requirements.txt...")
     try:
-        subprocess.check_call([sys.executable, "-m", "pip", "install", "-r", "requirements.txt"])
+        # Skip pip's PyPI self-version check and never block on a prompt
+        subprocess.check_call([
+            sys.executable, "-m", "pip", "install",
+            "--disable-pip-version-check", "--no-input", "-q",
+            "-r", "requirements.txt",
+        ])
         print_step("Dependencies installed successfully!")
         return True
     except subprocess.CalledProcessError:
@@ -37,9 +40,19 @@ def run_app():
     # Get the path to streamlit_app.py
     app_path = os.path.join(os.path.dirname(__file__), "streamlit_app.py")
     
+    cmd = [sys.executable, "-m", "streamlit", "run", app_path]
+
+    # On POSIX, replace this process with streamlit instead of spawning a child
+    if os.name != "nt":
+        sys.stdout.flush()
+        try:
+            os.execv(sys.executable, cmd)
+        except OSError as e:
+            print(f"[!] Could not exec streamlit ({e}), falling back to subprocess.")
+
     # Run streamlit
     try:
-        subprocess.run([sys.executable, "-m", "streamlit", "run", app_path])
+        subprocess.run(cmd)
     except KeyboardInterrupt:
         print("\n[*] MitreHunter stopped.")
 
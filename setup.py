@@ -11,7 +11,8 @@ setup(
         "pandas",
         "rich",
         "streamlit",
-        "stix2",
+        "orjson",
+        "pyarrow",
     ],
     entry_points={
         "console_scripts": [
@@ -1,38 +1,86 @@
 import streamlit as st
-import pandas as pd
-import time
-import threading
-from streamlit.runtime.scriptrunner import add_script_run_ctx
+from concurrent.futures import ThreadPoolExecutor
 try:
     from .loader import MitreLoader
     from .query import MitreQuery
-    from .loader import MitreLoader
-    from .query import MitreQuery
-    from .converter import SigmaConverter
+    from .converter import SigmaConverter, read_rule_file, export_json, export_yaml
     from . import __version__
 except ImportError:
     from loader import MitreLoader
     from query import MitreQuery
-    from converter import SigmaConverter
+    from converter import SigmaConverter, read_rule_file, export_json, export_yaml
     # Fallback if package import fails (e.g. running script directly)
     __version__ = "1.3.0"
-import json
 import io
-import yaml
+import csv
+
+EXPORT_FIELDS = ["TechniqueID", "TechniqueName", "RuleTitle", "RuleLevel", "SplunkQuery", "CrowdStrikeQuery"]
 
 st.set_page_config(page_title=f"MitreHunter v{__version__} | Enterprise Threat Hunting", page_icon="🛡️", layout="wide")
 
-@st.cache_data
+@st.cache_resource
 def load_data():
     loader = MitreLoader()
     return loader.parse_data()
 
-@st.cache_data
+def iter_rule_files(paths, default=""):
+    """Yields the raw YAML of each rule file in order while the remaining reads run in the background.
+    
+    A rule tagged with several techniques appears once per technique, so each
+    distinct path is read only once.
+    """
+    with ThreadPoolExecutor(max_workers=16) as executor:
+        futures = {}
+        for path in paths:
+            if path not in futures:
+                futures[path] = executor.submit(read_rule_file, path, default)
+        for path in paths:
+            yield futures[path].result()
+
+def read_rule_files(paths, default=""):
+    """Reads Sigma rule files concurrently (the reads are I/O bound), preserving order."""
+    return list(iter_rule_files(paths, default))
+
+@st.cache_resource
+def load_converter():
+    """Builds the Sigma converter on first use; pySigma and its backends are slow to import."""
+    return SigmaConverter(cache_dir=load_query().loader.sigma_queries_dir)
+
+@st.cache_data(max_entries=4096, show_spinner=False)
+def convert_rule(_converter, raw_yaml):
+    """Converts a Sigma rule to all targets, memoized on the raw YAML across reruns and sessions."""
+    return _converter.convert_to_all_cached(raw_yaml)
+
+def load_technique_view(query, technique_id):
+    """Gathers what the detail view shows for a technique.
+    
+    Returns:
+        tuple: The technique details (None if unknown) and a list of
+        (rule, raw_yaml, queries) entries, one per Sigma rule.
+    """
+    details = query.get_technique_details(technique_id)
+    sigma_rules = query.sigma_rules.get(technique_id, ())
+    if not details or not sigma_rules:
+        return details, []
+    converter = load_converter()
+    # Read every rule's raw YAML up front, concurrently
+    raw_yamls = read_rule_files([rule['path'] for rule in sigma_rules], default="Error reading rule file.")
+    return details, [
+        (rule, raw_yaml, convert_rule(converter, raw_yaml))
+        for rule, raw_yaml in zip(sigma_rules, raw_yamls)
+    ]
+
+@st.cache_resource
 def load_sigma_rules():
     loader = MitreLoader()
     # This now uses the JSON cache internally, so it's fast
     return loader.parse_sigma_rules()
 
+@st.cache_resource
+def load_query():
+    """Builds the query engine once; its derived lookups are then shared by every rerun and session."""
+    return MitreQuery(load_data(), load_sigma_rules())
+
 def main():
     st.title(f"🛡️ MitreHunter v{__version__}: Threat Hunting Tool")
     st.markdown("Query MITRE ATT&CK TTPs based on Data Sources for effective threat hunting.")
@@ -48,13 +96,10 @@ def main():
             df = load_data()
             
             st.write("Loading Sigma Rules (Cached)...")
-            sigma_rules = load_sigma_rules()
+            load_sigma_rules()
             
             st.write("Building Query Engine...")
-            query = MitreQuery(df, sigma_rules)
-            
-            st.write("Initializing Sigma Converter...")
-            converter = SigmaConverter()
+            query = load_query()
             
             st.session_state.data_loaded = True
             status.update(label="System Ready", state="complete", expanded=False)
@@ -66,16 +111,13 @@ def main():
     st.sidebar.header("Filters")
 
     # Filter by Data Source
-    all_datasources = query.get_all_datasources()
-    selected_datasource = st.sidebar.selectbox("Select Data Source", ["All"] + all_datasources)
+    selected_datasource = st.sidebar.selectbox("Select Data Source", ["All"] + query.all_datasources)
 
     # Filter by Tactic
-    all_tactics = query.get_all_tactics()
-    selected_tactic = st.sidebar.selectbox("Select Tactic", ["All"] + all_tactics)
+    selected_tactic = st.sidebar.selectbox("Select Tactic", ["All"] + query.all_tactics)
 
     # Filter by Threat Actor
-    all_actors = query.get_all_threat_actors()
-    selected_actor = st.sidebar.selectbox("Select Threat Actor", ["All"] + all_actors)
+    selected_actor = st.sidebar.selectbox("Select Threat Actor", ["All"] + query.all_threat_actors)
 
     # Search
     search_term = st.sidebar.text_input("Search by Keyword")
@@ -84,48 +126,32 @@ def main():
     show_sigma_only = st.sidebar.checkbox("Show only techniques with Detections (Sigma/Splunk/CS)")
 
     # Apply filters
-    filtered_df = df.copy()
-
-    if selected_datasource != "All":
-        # Re-implement filter logic here or use query object methods if they returned indices/df
-        # Using query object methods is cleaner but they return new DFs.
-        # Let's use the query object methods for consistency.
-        filtered_df = query.filter_by_datasource(selected_datasource)
-
-    if selected_tactic != "All":
-         # We need to chain filters. The query object methods start from full DF.
-         # So we should probably filter the 'filtered_df' manually or refactor query.py to accept a DF.
-         # For simplicity, let's just filter 'filtered_df' here using the logic from query.py
-         tactic = selected_tactic.lower().replace(" ", "-")
-         mask = filtered_df['tactics'].apply(lambda x: any(tactic in t.lower().replace(" ", "-") for t in x) if isinstance(x, list) else False)
-         filtered_df = filtered_df[mask]
-
-    if selected_actor != "All":
-        actor = selected_actor.lower()
-        mask = filtered_df['threat_actors'].apply(lambda x: any(actor in a.lower() for a in x) if isinstance(x, list) else False)
-        filtered_df = filtered_df[mask]
+    # All filters are fused into one boolean mask over df; the frame is sliced once at the end
+    mask = query.filter_mask(
+        datasource=None if selected_datasource == "All" else selected_datasource,
+        tactic=None if selected_tactic == "All" else selected_tactic,
+        threat_actor=None if selected_actor == "All" else selected_actor,
+        keyword=search_term or None,
+        sigma_only=show_sigma_only,
+    )
 
-    if search_term:
-        keyword = search_term.lower()
-        mask = filtered_df.apply(lambda x: keyword in x['name'].lower() or keyword in x['description'].lower(), axis=1)
-        filtered_df = filtered_df[mask]
-        
-    if show_sigma_only:
-        sigma_ids = set(query.sigma_rules.keys())
-        # Filter for IDs that are in the sigma_rules dict
-        mask = filtered_df['external_id'].isin(sigma_ids)
-        filtered_df = filtered_df[mask]
+    # Slice once; with no active filter, reuse df itself (it is never written to)
+    filtered_df = df if mask.all() else df[mask]
 
     # Display results
     st.subheader(f"Found {len(filtered_df)} Techniques")
 
     if not filtered_df.empty:
+        # Positional arrays of the two columns row selections need, so selections index arrays, not frames
+        ids_arr = filtered_df['external_id'].to_numpy()
+        names_arr = filtered_df['name'].to_numpy()
+        
         # Add Sigma count column for display
-        # We use a lambda to look up the count from the query object
-        filtered_df['sigma_count'] = filtered_df['external_id'].apply(lambda x: len(query.get_sigma_rules_for_technique(x)))
+        # df is shared across sessions (cache_resource), so build a new frame rather than writing into it
+        sigma_count = filtered_df['external_id'].map(query.sigma_counts).fillna(0).astype('int32')
         
         # Display as a dataframe with specific columns
-        display_df = filtered_df[['external_id', 'name', 'sigma_count', 'tactics', 'data_sources', 'platforms', 'threat_actors']]
+        display_df = filtered_df.assign(sigma_count=sigma_count)[['external_id', 'name', 'sigma_count', 'tactics', 'data_sources', 'platforms', 'threat_actors']]
         display_df = display_df.rename(columns={"sigma_count": "Detections"})
         
         # Interactive Table
@@ -151,54 +177,55 @@ def main():
             
             if st.sidebar.button("⚡ Generate Export Artifacts"):
                 with st.status("Generating Artifacts...", expanded=True) as status:
-                    export_df_source = filtered_df.iloc[selected_indices]
+                    converter = load_converter()
+                    # Flatten to (technique, rule) pairs so all rule files can be read up front
+                    export_rules = [
+                        (tech_id, tech_name, rule)
+                        for tech_id, tech_name in zip(ids_arr[selected_indices], names_arr[selected_indices])
+                        for rule in query.sigma_rules.get(tech_id, ())
+                    ]
+                    # Rule files are read on a thread pool while this thread converts the ones already loaded
+                    raw_yamls = iter_rule_files([rule['path'] for _, _, rule in export_rules])
+                    
                     all_export_data = []
+                    # CSV rows are written as they are produced rather than via an intermediate DataFrame
+                    csv_buffer = io.StringIO()
+                    csv_writer = csv.DictWriter(csv_buffer, fieldnames=EXPORT_FIELDS, lineterminator="\n")
+                    csv_writer.writeheader()
                     progress_bar = status.progress(0)
-                    total_rows = len(export_df_source)
+                    total_rules = len(export_rules)
+                    # Each progress update is a websocket round trip, so send at most ~100 of them
+                    progress_step = max(1, total_rules // 100)
                     
-                    for idx, (index, row) in enumerate(export_df_source.iterrows()):
-                        tech_id = row['external_id']
-                        tech_name = row['name']
+                    for idx, ((tech_id, tech_name, rule), raw_yaml) in enumerate(zip(export_rules, raw_yamls)):
+                        queries = convert_rule(converter, raw_yaml)
                         
-                        rules = query.get_sigma_rules_for_technique(tech_id)
-                        if rules:
-                            for rule in rules:
-                                try:
-                                    with open(rule['path'], 'r', encoding='utf-8') as f:
-                                        raw_yaml = f.read()
-                                except:
-                                    raw_yaml = ""
-                                
-                                queries = converter.convert_to_all(raw_yaml)
-                                
-                                all_export_data.append({
-                                    "TechniqueID": tech_id,
-                                    "TechniqueName": tech_name,
-                                    "RuleTitle": rule['title'],
-                                    "RuleLevel": rule['level'],
-                                    "SplunkQuery": queries['splunk'],
-                                    "CrowdStrikeQuery": queries['crowdstrike']
-                                })
+                        export_row = {
+                            "TechniqueID": tech_id,
+                            "TechniqueName": tech_name,
+                            "RuleTitle": rule['title'],
+                            "RuleLevel": rule['level'],
+                            "SplunkQuery": queries['splunk'],
+                            "CrowdStrikeQuery": queries['crowdstrike']
+                        }
+                        all_export_data.append(export_row)
+                        csv_writer.writerow(export_row)
                         
-                        progress_bar.progress((idx + 1) / total_rows)
-                    
-                    # Prepare downloads
-                    export_df = pd.DataFrame(all_export_data)
-                    
-                    # CSV
-                    csv_data = export_df.to_csv(index=False).encode('utf-8')
+                        if (idx + 1) % progress_step == 0:
+                            progress_bar.progress((idx + 1) / total_rules)
                     
-                    # JSON
-                    json_str = json.dumps(all_export_data, indent=2)
+                    progress_bar.progress(1.0)
                     
-                    # YAML
-                    yaml_str = yaml.dump(all_export_data, sort_keys=False)
+                    # Prepare downloads
+                    csv_data = csv_buffer.getvalue().encode('utf-8')
+                    json_bytes = export_json(all_export_data)
+                    yaml_str = export_yaml(all_export_data)
                     
                     status.update(label="Artifacts Ready!", state="complete", expanded=False)
                     
                     st.sidebar.markdown("### Download")
                     st.sidebar.download_button("📥 Download CSV", csv_data, "mitre_hunter_export.csv", "text/csv")
-                    st.sidebar.download_button("📥 Download JSON", json_str, "mitre_hunter_export.json", "application/json")
+                    st.sidebar.download_button("📥 Download JSON", json_bytes, "mitre_hunter_export.json", "application/json")
                     st.sidebar.download_button("📥 Download YAML", yaml_str, "mitre_hunter_export.yaml", "application/x-yaml")
 
         # Detailed view selection logic
@@ -207,61 +234,44 @@ def main():
         if len(selected_indices) > 0:
             st.markdown("---")
             
-            # Get selected rows
-            selected_rows = display_df.iloc[selected_indices]
-            options = selected_rows['external_id'].tolist()
+            # Get selected technique IDs
+            options = ids_arr[selected_indices].tolist()
             
             # Dropdown
             selected_id = st.selectbox("Select Technique to View Details", options=options)
         
         if selected_id:
+            # Filter changes rerun the script with the same selection; reuse its prepared
+            # view instead of re-reading and re-converting its rule files
+            if st.session_state.get('details_id') != selected_id:
+                st.session_state.details_view = load_technique_view(query, selected_id)
+                st.session_state.details_id = selected_id
+            details, rule_views = st.session_state.details_view
+            
             st.subheader(f"Technique Details: {selected_id}")
-            details = query.get_technique_details(selected_id)
             if details:
                 col1, col2 = st.columns(2)
                 with col1:
                     st.markdown(f"**ID:** {details['external_id']}")
                     st.markdown(f"**Name:** {details['name']}")
-                    st.markdown(f"**Tactics:** {', '.join(details['tactics'])}")
-                    st.markdown(f"**Threat Actors:** {', '.join(details.get('threat_actors', []))}")
+                    st.markdown(f"**Tactics:** {details['tactics_str']}")
+                    st.markdown(f"**Threat Actors:** {details['threat_actors_str']}")
                 with col2:
-                    st.markdown(f"**Platforms:** {', '.join(details['platforms'])}")
-                    st.markdown(f"**Data Sources:** {details['data_sources']}")
+                    st.markdown(f"**Platforms:** {details['platforms_str']}")
+                    st.markdown(f"**Data Sources:** {details['data_sources_str']}")
                     st.markdown(f"[Link to MITRE ATT&CK]({details['url']})")
                 
                 st.markdown("### Description")
                 st.markdown(details['description'])
                 
                 # Sigma Rules Section
-                sigma_rules = query.get_sigma_rules_for_technique(selected_id)
-                if sigma_rules:
-                    st.markdown(f"### Detection Queries ({len(sigma_rules)})")
+                if rule_views:
+                    st.markdown(f"### Detection Queries ({len(rule_views)})")
                     
-                    # Prepare export data
-                    export_data = []
-                    
-                    for rule in sigma_rules:
+                    for rule, raw_yaml, queries in rule_views:
                         with st.expander(f"{rule['title']} ({rule['level']})"):
                             st.markdown(f"**Description:** {rule['description']}")
                             
-                            # Read raw YAML
-                            try:
-                                with open(rule['path'], 'r', encoding='utf-8') as f:
-                                    raw_yaml = f.read()
-                            except Exception:
-                                raw_yaml = "Error reading rule file."
-                            
-                            # Convert on-the-fly
-                            queries = converter.convert_to_all(raw_yaml)
-                            
-                            # Add to export list
-                            export_data.append({
-                                "title": rule['title'],
-                                "id": rule['id'],
-                                "splunk": queries['splunk'],
-                                "crowdstrike": queries['crowdstrike']
-                            })
-                            
                             # Display Tabs
                             tab1, tab2, tab3 = st.tabs(["Sigma Rule", "Splunk", "CrowdStrike"])
                             
@@ -271,9 +281,6 @@ def main():
                                 st.code(queries['splunk'], language='splunk')
                             with tab3:
                                 st.code(queries['crowdstrike'], language='text')
-                    
-
-                    
                 else:
                     st.info("No Sigma rules found for this technique.")
 
@@ -1,193 +1,513 @@
 import argparse
+import os
+import socket
 import sys
-from rich.console import Console
-from rich.table import Table
-from rich.markdown import Markdown
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+from functools import lru_cache
 try:
-    from .loader import MitreLoader
-    from .loader import MitreLoader
-    from .query import MitreQuery
     from . import __version__
 except ImportError:
-    from loader import MitreLoader
-    from query import MitreQuery
     __version__ = "1.3.0"
-import json
-import yaml
-import csv
 
-console = Console()
+# Unix socket of `daemon` mode; read-only commands are forwarded to it when it exists
+DAEMON_SOCKET = os.environ.get(
+    "MITRE_HUNTER_SOCKET",
+    os.path.join(os.path.expanduser("~"), ".cache", "mitre_hunter", "sock"),
+)
+# Seconds a client waits for the daemon to accept its connection; a suspended or busy
+# daemon still has connections queued by the kernel, but never acknowledges them
+DAEMON_ACK_TIMEOUT = 1
+# Seconds a client waits on an acknowledging daemon before running the command itself
+DAEMON_TIMEOUT = 30
+# Seconds the daemon waits for a client's request line, so a silent client can't wedge it
+DAEMON_REQUEST_TIMEOUT = 5
+# Sent by the daemon as soon as it picks up a connection
+DAEMON_ACCEPTED = b"READY\n"
+# First line of each daemon reply: output follows, or the client should run the command itself
+DAEMON_ANSWERED = b"OK\n"
+DAEMON_DECLINED = b"LOCAL\n"
 
-def print_techniques(techniques, title="Techniques"):
+# rich, pandas and pySigma are imported by the commands that use them, so
+# help output and argument errors don't pay for their import graphs
+
+@lru_cache(maxsize=1)
+def _get_console():
+    """Returns the shared Rich console, importing Rich on first use."""
+    from rich.console import Console
+    return Console()
+
+def _status(console, message):
+    """Returns a spinner for `message`, or a no-op context when output isn't interactive.
+    
+    A Rich status runs a refresh thread even when nothing can be animated, e.g.
+    when output is piped, and its frames and cursor codes would end up in the
+    output rendered for a daemon client (a terminal console, but not interactive).
+    """
+    if console.is_interactive:
+        return console.status(message, spinner="dots")
+    return nullcontext()
+
+def _get_loader():
+    """Returns a new MitreLoader, importing the loader (and pandas) on first use."""
+    try:
+        from .loader import MitreLoader
+    except ImportError:
+        from loader import MitreLoader
+    return MitreLoader()
+
+@lru_cache(maxsize=1)
+def _get_query():
+    """Returns the shared MitreQuery, parsing the ATT&CK data on first use only."""
+    try:
+        from .query import MitreQuery
+    except ImportError:
+        from query import MitreQuery
+    return MitreQuery()
+
+@lru_cache(maxsize=1)
+def _get_sigma_query():
+    """Returns a MitreQuery over the shared data with the Sigma rules attached.
+    
+    It reuses the shared query's DataFrame and loader, whose Sigma rules are
+    parsed once per process (the daemon answers many info requests).
+    """
+    try:
+        from .query import MitreQuery
+    except ImportError:
+        from query import MitreQuery
+    base = _get_query()
+    return MitreQuery(base.df, base.loader.sigma_rules)
+
+# (header, DataFrame column, Rich style) for each column of a techniques table
+TABLE_COLUMNS = [
+    ("ID", "external_id", "cyan"),
+    ("Name", "name", "magenta"),
+    ("Data Sources", "data_sources_str", "green"),
+    ("Tactics", "tactics_str", "blue"),
+    ("Threat Actors", "threat_actors_str", "red"),
+]
+
+# Above this many rows, tables are printed as plain text; Rich measures and styles every cell
+RICH_TABLE_MAX_ROWS = 50
+
+def print_techniques(techniques, title="Techniques", console=None):
+    console = console or _get_console()
     if techniques.empty:
         console.print(f"[yellow]No techniques found for {title}.[/yellow]")
         return
 
+    if len(techniques) > RICH_TABLE_MAX_ROWS:
+        print_techniques_plain(techniques, title, console)
+        return
+
+    from rich.table import Table
     table = Table(title=title)
-    table.add_column("ID", style="cyan", no_wrap=True)
-    table.add_column("Name", style="magenta")
-    table.add_column("Data Sources", style="green")
-    table.add_column("Tactics", style="blue")
-    table.add_column("Threat Actors", style="red")
-
-    for _, row in techniques.iterrows():
-        ds = ", ".join(row['data_sources']) if isinstance(row['data_sources'], list) else ""
-        tactics = ", ".join(row['tactics']) if isinstance(row['tactics'], list) else ""
-        actors = ", ".join(row['threat_actors']) if isinstance(row.get('threat_actors'), list) else ""
-        table.add_row(row['external_id'], row['name'], ds, tactics, actors)
+    for header, _, style in TABLE_COLUMNS:
+        table.add_column(header, style=style, no_wrap=header == "ID")
+
+    # Zip the columns directly rather than iterrows(), which builds a Series per row;
+    # the loader has already joined the list columns into display strings
+    for row in zip(*(techniques[column].to_numpy() for _, column, _ in TABLE_COLUMNS)):
+        table.add_row(*row)
 
     console.print(table)
 
-def main():
-    parser = argparse.ArgumentParser(description=f"MitreHunter v{__version__}: Query MITRE ATT&CK TTPs")
-    subparsers = parser.add_subparsers(dest="command", help="Command to execute")
+def print_techniques_plain(techniques, title="Techniques", console=None):
+    """Prints techniques as a fixed-width plain-text table in a single write.
+    
+    Args:
+        techniques: DataFrame of techniques to print.
+        title: Title printed above the table.
+        console: Rich console to print to (the shared console if None).
+    """
+    headers = [header for header, _, _ in TABLE_COLUMNS]
+    columns = [techniques[column].fillna("").astype(str) for _, column, _ in TABLE_COLUMNS]
+    widths = [max(len(header), int(col.str.len().max())) for header, col in zip(headers, columns)]
+
+    # Pad every column at once, then glue them row-wise; the last column needs no padding
+    padded = [col.str.ljust(width) for col, width in zip(columns[:-1], widths)]
+    rows = padded[0].str.cat(padded[1:] + [columns[-1]], sep="  ")
+
+    lines = [
+        title,
+        "  ".join(header.ljust(width) for header, width in zip(headers, widths)).rstrip(),
+        "  ".join("-" * width for width in widths),
+    ]
+    lines.extend(rows.str.rstrip())
+    (console or _get_console()).print("\n".join(lines), markup=False, highlight=False, soft_wrap=True)
+
+def cmd_update(args, console):
+    with _status(console, "[bold green]Updating MITRE ATT&CK data...[/bold green]"):
+        loader = _get_loader()
+        loader.download_data(force=True)
+        loader.parse_data()
+    console.print("[bold green]Update complete.[/bold green]")
+
+def cmd_search(args, console):
+    with _status(console, "[bold green]Loading data...[/bold green]"):
+        query = _get_query()
+    results = query.search_by_keyword(args.keyword)
+    print_techniques(results, f"Search Results for '{args.keyword}'", console)
+
+def cmd_hunt(args, console):
+    with _status(console, "[bold green]Loading data...[/bold green]"):
+        query = _get_query()
+    results = query.filter_by_datasource(args.datasource)
+    print_techniques(results, f"Techniques for Data Source: '{args.datasource}'", console)
+
+def cmd_actor(args, console):
+    with _status(console, "[bold green]Loading data...[/bold green]"):
+        query = _get_query()
+    results = query.filter_by_threat_actor(args.name)
+    print_techniques(results, f"Techniques for Threat Actor: '{args.name}'", console)
+
+def cmd_info(args, console):
+    with _status(console, "[bold green]Loading data...[/bold green]"):
+        # Load Sigma rules (cached)
+        console.log("Loading Sigma rules...")
+        query = _get_sigma_query()
+        loader = query.loader
+        
+    details = query.get_technique_details(args.id)
+    if details:
+        console.print(f"[bold cyan]ID:[/bold cyan] {details['external_id']}")
+        console.print(f"[bold cyan]Name:[/bold cyan] {details['name']}")
+        console.print(f"[bold cyan]Description:[/bold cyan] {details['description'][:200]}...")
+        console.print(f"[bold cyan]URL:[/bold cyan] {details['url']}")
+        console.print(f"[bold cyan]Data Sources:[/bold cyan] {details['data_sources_str']}")
+        
+        # Sigma Rules
+        sigma_rules = query.get_sigma_rules_for_technique(args.id)
+        if sigma_rules:
+            console.print(f"\n[bold green]Sigma Rules ({len(sigma_rules)}):[/bold green]")
+            
+            # Initialize converter (only needed when there is something to convert)
+            try:
+                from .converter import SigmaConverter, read_rule_file, export_json, export_yaml
+            except ImportError:
+                from converter import SigmaConverter, read_rule_file, export_json, export_yaml
+            converter = SigmaConverter(cache_dir=loader.sigma_queries_dir)
+            
+            export_data = []
+            
+            # Rule files are read on a pool (map() keeps rule order); conversion stays on this
+            # thread, since pySigma backends keep per-conversion state and aren't re-entrant
+            with ThreadPoolExecutor(max_workers=min(8, len(sigma_rules))) as executor:
+                raw_yamls = list(executor.map(read_rule_file, [rule['path'] for rule in sigma_rules]))
+            
+            for rule, raw_yaml in zip(sigma_rules, raw_yamls):
+                queries = converter.convert_to_all_cached(raw_yaml)
+                console.print(f"- {rule['title']} ({rule['level']})")
+                
+                # Add to export list
+                export_data.append({
+                    "title": rule['title'],
+                    "id": rule['id'],
+                    "splunk": queries['splunk'],
+                    "crowdstrike": queries['crowdstrike']
+                })
+                
+                # Display queries in CLI (truncated for readability)
+                console.print(f"  [dim]Splunk:[/dim] {queries['splunk'][:100]}...")
+                console.print(f"  [dim]CrowdStrike:[/dim] {queries['crowdstrike'][:100]}...")
+
+            # Handle Export
+            if args.export:
+                filename = f"{args.id}_sigma_queries.{args.export}"
+                try:
+                    if args.export == 'json':
+                        with open(filename, 'wb') as f:
+                            f.write(export_json(export_data))
+                    elif args.export == 'yaml':
+                        with open(filename, 'w', encoding='utf-8') as f:
+                            export_yaml(export_data, f)
+                    elif args.export == 'csv':
+                        import csv
+                        with open(filename, 'w', newline='', encoding='utf-8') as f:
+                            writer = csv.DictWriter(f, fieldnames=["title", "id", "splunk", "crowdstrike"])
+                            writer.writeheader()
+                            writer.writerows(export_data)
+                    
+                    console.print(f"\n[bold green]Successfully exported queries to {filename}[/bold green]")
+                except Exception as e:
+                    console.print(f"\n[bold red]Export failed: {e}[/bold red]")
+        else:
+            console.print("\n[yellow]No Sigma rules found.[/yellow]")
+    else:
+        console.print(f"[bold red]Technique {args.id} not found.[/bold red]")
+
+def cmd_datasources(args, console):
+    with _status(console, "[bold green]Loading data...[/bold green]"):
+        query = _get_query()
+    datasources = query.all_datasources
+    console.print(f"[bold green]Data Sources ({len(datasources)}):[/bold green]")
+    for datasource in datasources:
+        console.print(f"- {datasource}", markup=False, highlight=False)
+
+def cmd_sigma(args, console):
+    if args.sigma_command == "update":
+        with _status(console, "[bold green]Updating Sigma rules...[/bold green]"):
+            _get_loader().download_sigma_rules()
+        console.print("[bold green]Sigma rules updated successfully![/bold green]")
+
+def cmd_daemon(args, console):
+    """Serves CLI commands over a Unix socket from a process that keeps the data loaded."""
+    import io
+    import json
+    import signal
+    import socketserver
+    import stat
+    from contextlib import redirect_stderr, redirect_stdout
+    from rich.console import Console
+
+    if not hasattr(socketserver, "UnixStreamServer"):
+        console.print("[bold red]Daemon mode needs Unix domain sockets, which this platform lacks.[/bold red]")
+        return
+    if _connect_daemon() is not None:
+        console.print(f"[bold red]A daemon is already listening on {DAEMON_SOCKET}.[/bold red]")
+        return
+    try:
+        if not stat.S_ISSOCK(os.lstat(DAEMON_SOCKET).st_mode):
+            # MITRE_HUNTER_SOCKET may point at a file by mistake; never delete it
+            console.print(f"[bold red]{DAEMON_SOCKET} exists and is not a socket; not starting.[/bold red]")
+            return
+        os.remove(DAEMON_SOCKET)  # left behind by a daemon that didn't shut down cleanly
+    except FileNotFoundError:
+        pass
+
+    loader = _get_loader()
+
+    def data_version():
+        """Returns the STIX file's mtime and the Sigma checkout's HEAD; 'update' and 'sigma update' change them."""
+        try:
+            mtime_ns = os.stat(loader.local_file).st_mtime_ns
+        except OSError:
+            mtime_ns = None
+        return mtime_ns, loader._sigma_revision()
+
+    def reload():
+        """Drops the loaded data and loads it again from disk."""
+        nonlocal loaded_version
+        # Taken first, so a change made while reloading is caught by the next request
+        loaded_version = data_version()
+        _get_sigma_query.cache_clear()
+        _get_query.cache_clear()
+        try:
+            with _status(console, "[bold green]Data changed on disk; reloading...[/bold green]"):
+                _get_query()
+            console.print("[bold green]Reloaded the updated data.[/bold green]")
+        except Exception as e:
+            # The next request loads it again, and reports the error to its client
+            console.print(f"[bold red]Error reloading data: {e}[/bold red]")
+
+    class Handler(socketserver.StreamRequestHandler):
+        # Bounds every read and write on the connection; the server handles one at a time
+        timeout = DAEMON_REQUEST_TIMEOUT
+
+        def handle(self):
+            try:
+                self.wfile.write(DAEMON_ACCEPTED)
+                request = json.loads(self.rfile.readline())
+                argv = request["argv"]
+                color = bool(request.get("color"))
+                width = int(request.get("width", 80))
+            except (ValueError, TypeError, KeyError, OSError):
+                # Includes socket.timeout: the client went quiet or away
+                return
+            if not isinstance(argv, list) or os.path.realpath(str(request.get("data_dir", ""))) != data_dir:
+                # Another checkout's data (or a malformed request): the client runs it itself
+                self.wfile.write(DAEMON_DECLINED)
+                return
+            if data_version() != loaded_version:
+                # 'update' or 'sigma update' replaced the data, and a Sigma update may have deleted
+                # rule files the loaded index points to. The client runs this command itself,
+                # on the new data, while the daemon reloads
+                self.wfile.write(DAEMON_DECLINED)
+                self.request.shutdown(socket.SHUT_WR)
+                reload()
+                return
+            # Render into a buffer shaped like the client's terminal, then send it back whole
+            buffer = io.StringIO()
+            out = Console(file=buffer, width=width, force_terminal=color, force_interactive=False,
+                          color_system="standard" if color else None)
+            try:
+                # argparse reports bad input by printing usage and raising SystemExit;
+                # both go back to the client instead of stopping the server
+                with redirect_stdout(buffer), redirect_stderr(buffer):
+                    args = build_parser().parse_args(argv)
+            except SystemExit:
+                args = None
+            except Exception as e:
+                args = None
+                out.print(f"[bold red]Error: {e}[/bold red]")
+            if args is not None:
+                try:
+                    # The client only forwards these, but the socket is checked independently
+                    if args.command not in DAEMON_COMMANDS or getattr(args, "export", None):
+                        raise ValueError(f"'{' '.join(argv)}' must be run directly, not through the daemon")
+                    COMMANDS[args.command][1](args, out)
+                except Exception as e:
+                    out.print(f"[bold red]Error: {e}[/bold red]")
+            try:
+                self.wfile.write(DAEMON_ANSWERED + buffer.getvalue().encode("utf-8"))
+            except OSError:
+                pass  # the client gave up waiting and runs the command itself
+
+    loaded_version = data_version()
+    with _status(console, "[bold green]Loading data...[/bold green]"):
+        _get_query()
+    data_dir = os.path.realpath(loader.data_dir)
+    # Owner-only directory and socket: requests run with this user's data and permissions
+    os.makedirs(os.path.dirname(DAEMON_SOCKET), mode=0o700, exist_ok=True)
+    # Shut down the same way (removing the socket) on SIGTERM as on Ctrl+C
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+    # Create the socket owner-only from the start; the directory may already exist
+    # with looser permissions (e.g. under /tmp), so a chmod after bind would leave a window
+    old_umask = os.umask(0o077)
+    try:
+        server = socketserver.UnixStreamServer(DAEMON_SOCKET, Handler)
+    finally:
+        os.umask(old_umask)
+    with server:
+        console.print(f"[bold green]Daemon listening on {DAEMON_SOCKET} (Ctrl+C to stop).[/bold green]")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            os.remove(DAEMON_SOCKET)
 
-    # Update command
+def _connect_daemon():
+    """Returns a socket connected to a running daemon, or None if none is listening."""
+    if not hasattr(socket, "AF_UNIX") or not os.path.exists(DAEMON_SOCKET):
+        return None
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    # Bounds the connect and the wait for the acknowledgement; the reply gets longer
+    sock.settimeout(DAEMON_ACK_TIMEOUT)
+    try:
+        sock.connect(DAEMON_SOCKET)
+    except OSError:
+        sock.close()
+        return None
+    return sock
+
+def _run_via_daemon(argv):
+    """Forwards argv to a running daemon and copies its output to stdout.
+    
+    Args:
+        argv: Command-line arguments, already validated by the local parser.
+        
+    Returns:
+        bool: True if a daemon handled the command, False if the command should
+        run locally (no daemon, a daemon serving other data, or no timely reply).
+    """
+    import json
+    import shutil
+
+    sock = _connect_daemon()
+    if sock is None:
+        return False
+    request = {
+        "argv": argv,
+        "width": shutil.get_terminal_size().columns,
+        "color": sys.stdout.isatty(),
+        # MitreLoader's default data directory, which the daemon must be serving
+        "data_dir": os.path.realpath("data"),
+    }
+    try:
+        with sock, sock.makefile("rb") as reader:
+            # A daemon that doesn't acknowledge promptly is suspended or busy with another client
+            if reader.readline() != DAEMON_ACCEPTED:
+                return False
+            sock.settimeout(DAEMON_TIMEOUT)
+            sock.sendall(json.dumps(request).encode("utf-8") + b"\n")
+            sock.shutdown(socket.SHUT_WR)
+            # Buffered whole, so nothing is printed twice if this falls back to running locally
+            response = reader.read()
+    except OSError:
+        # Includes socket.timeout
+        return False
+    if not response.startswith(DAEMON_ANSWERED):
+        return False
+    sys.stdout.buffer.write(response[len(DAEMON_ANSWERED):])
+    sys.stdout.flush()
+    return True
+
+def _add_update_parser(subparsers):
     subparsers.add_parser("update", help="Download latest MITRE ATT&CK data")
 
-    # Search command
+def _add_search_parser(subparsers):
     search_parser = subparsers.add_parser("search", help="Search techniques by keyword")
     search_parser.add_argument("keyword", help="Keyword to search for")
 
-    # Hunt command
+def _add_hunt_parser(subparsers):
     hunt_parser = subparsers.add_parser("hunt", help="Find techniques by data source")
     hunt_parser.add_argument("--datasource", required=True, help="Data source to filter by (e.g., 'Process Monitoring')")
 
-    # Actor command
+def _add_actor_parser(subparsers):
     actor_parser = subparsers.add_parser("actor", help="Find techniques by Threat Actor")
     actor_parser.add_argument("name", help="Threat Actor name (e.g., 'APT29')")
 
-    # Info command
+def _add_info_parser(subparsers):
     info_parser = subparsers.add_parser("info", help="Get details for a specific technique")
     info_parser.add_argument("id", help="Technique ID (e.g., T1003)")
     info_parser.add_argument("--export", choices=['json', 'csv', 'yaml'], help="Export Sigma queries to a file")
 
-    # List Data Sources command
+def _add_datasources_parser(subparsers):
     subparsers.add_parser("datasources", help="List all available data sources")
 
-    args = parser.parse_args()
-
-    if args.command == "update":
-        with console.status("[bold green]Updating MITRE ATT&CK data...[/bold green]", spinner="dots"):
-            query = MitreQuery()
-            query.loader.download_data(force=True)
-            query.loader.parse_data()
-        console.print("[bold green]Update complete.[/bold green]")
-
-    elif args.command == "search":
-        with console.status("[bold green]Loading data...[/bold green]", spinner="dots"):
-            query = MitreQuery()
-        results = query.search_by_keyword(args.keyword)
-        print_techniques(results, f"Search Results for '{args.keyword}'")
-
-    elif args.command == "hunt":
-        with console.status("[bold green]Loading data...[/bold green]", spinner="dots"):
-            query = MitreQuery()
-        results = query.filter_by_datasource(args.datasource)
-        print_techniques(results, f"Techniques for Data Source: '{args.datasource}'")
-
-    elif args.command == "actor":
-        with console.status("[bold green]Loading data...[/bold green]", spinner="dots"):
-            query = MitreQuery()
-        results = query.filter_by_threat_actor(args.name)
-        print_techniques(results, f"Techniques for Threat Actor: '{args.name}'")
-
-    elif args.command == "info":
-        with console.status("[bold green]Loading data...[/bold green]", spinner="dots"):
-            # Load MITRE data
-            query = MitreQuery()
-            
-            # Load Sigma rules (cached)
-            console.log("Loading Sigma rules...")
-            loader = MitreLoader()
-            sigma_rules = loader.parse_sigma_rules()
-            query.sigma_rules = sigma_rules
-            
-            # Initialize converter
-            try:
-                from .converter import SigmaConverter
-                converter = SigmaConverter()
-            except ImportError:
-                from converter import SigmaConverter
-                converter = SigmaConverter()
-            
-        details = query.get_technique_details(args.id)
-        if details:
-            console.print(f"[bold cyan]ID:[/bold cyan] {details['external_id']}")
-            console.print(f"[bold cyan]Name:[/bold cyan] {details['name']}")
-            console.print(f"[bold cyan]Description:[/bold cyan] {details['description'][:200]}...")
-            console.print(f"[bold cyan]URL:[/bold cyan] {details['url']}")
-            console.print(f"[bold cyan]Data Sources:[/bold cyan] {details['data_sources']}")
-            
-            # Sigma Rules
-            sigma_rules = query.get_sigma_rules_for_technique(args.id)
-            if sigma_rules:
-                console.print(f"\n[bold green]Sigma Rules ({len(sigma_rules)}):[/bold green]")
-                
-                export_data = []
-                
-                for rule in sigma_rules:
-                    console.print(f"- {rule['title']} ({rule['level']})")
-                    
-                    # Read raw YAML
-                    try:
-                        with open(rule['path'], 'r', encoding='utf-8') as f:
-                            raw_yaml = f.read()
-                    except Exception:
-                        raw_yaml = ""
-                    
-                    # Convert
-                    queries = converter.convert_to_all(raw_yaml)
-                    
-                    # Add to export list
-                    export_data.append({
-                        "title": rule['title'],
-                        "id": rule['id'],
-                        "splunk": queries['splunk'],
-                        "crowdstrike": queries['crowdstrike']
-                    })
-                    
-                    # Display queries in CLI (truncated for readability)
-                    console.print(f"  [dim]Splunk:[/dim] {queries['splunk'][:100]}...")
-                    console.print(f"  [dim]CrowdStrike:[/dim] {queries['crowdstrike'][:100]}...")
-
-                # Handle Export
-                if args.export:
-                    filename = f"{args.id}_sigma_queries.{args.export}"
-                    try:
-                        if args.export == 'json':
-                            import json
-                            with open(filename, 'w', encoding='utf-8') as f:
-                                json.dump(export_data, f, indent=2)
-                        elif args.export == 'yaml':
-                            import yaml
-                            with open(filename, 'w', encoding='utf-8') as f:
-                                yaml.dump(export_data, f, sort_keys=False)
-                        elif args.export == 'csv':
-                            import csv
-                            with open(filename, 'w', newline='', encoding='utf-8') as f:
-                                writer = csv.DictWriter(f, fieldnames=["title", "id", "splunk", "crowdstrike"])
-                                writer.writeheader()
-                                writer.writerows(export_data)
-                        
-                        console.print(f"\n[bold green]Successfully exported queries to {filename}[/bold green]")
-                    except Exception as e:
-                        console.print(f"\n[bold red]Export failed: {e}[/bold red]")
-            else:
-                console.print("\n[yellow]No Sigma rules found.[/yellow]")
-        else:
-            console.print(f"[bold red]Technique {args.id} not found.[/bold red]")
-
-    elif args.command == "sigma":
-        if args.sigma_command == "update":
-            with console.status("[bold green]Updating Sigma rules...[/bold green]", spinner="dots"):
-                loader = MitreLoader()
-                loader.download_sigma_rules()
-            console.print("[bold green]Sigma rules updated successfully![/bold green]")
-        else:
-            parser.print_help() # Or sigma_parser.print_help()
-    else:
+def _add_daemon_parser(subparsers):
+    subparsers.add_parser("daemon", help="Keep the data loaded and serve read-only commands from other invocations")
+
+def _add_sigma_parser(subparsers):
+    sigma_parser = subparsers.add_parser("sigma", help="Manage the local Sigma rules checkout")
+    sigma_parser.add_argument("sigma_command", choices=["update"], help="Sigma action to run")
+
+# Command name -> (subparser builder, handler)
+COMMANDS = {
+    "update": (_add_update_parser, cmd_update),
+    "search": (_add_search_parser, cmd_search),
+    "hunt": (_add_hunt_parser, cmd_hunt),
+    "actor": (_add_actor_parser, cmd_actor),
+    "info": (_add_info_parser, cmd_info),
+    "datasources": (_add_datasources_parser, cmd_datasources),
+    "sigma": (_add_sigma_parser, cmd_sigma),
+    "daemon": (_add_daemon_parser, cmd_daemon),
+}
+
+# Read-only commands a running daemon answers; the rest always run locally
+DAEMON_COMMANDS = {"search", "hunt", "actor", "info", "datasources"}
+
+def build_parser(commands=None):
+    """Builds the argument parser.
+    
+    Args:
+        commands: Names of the commands to add subparsers for (all commands if None).
+        
+    Returns:
+        argparse.ArgumentParser: The configured parser.
+    """
+    parser = argparse.ArgumentParser(description=f"MitreHunter v{__version__}: Query MITRE ATT&CK TTPs")
+    subparsers = parser.add_subparsers(dest="command", help="Command to execute")
+    for name in commands or COMMANDS:
+        COMMANDS[name][0](subparsers)
+    return parser
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    # Only the invoked command's subparser is built; help, typos and a missing
+    # command get the full parser so usage lists every command
+    command = argv[0] if argv and argv[0] in COMMANDS else None
+    parser = build_parser([command] if command else None)
+    args = parser.parse_args(argv)
+    if args.command is None:
         parser.print_help()
+        return
+    # info --export writes into the caller's working directory, so it stays local
+    if args.command in DAEMON_COMMANDS and not getattr(args, "export", None) and _run_via_daemon(argv):
+        return
+    COMMANDS[args.command][1](args, _get_console())
 
 if __name__ == "__main__":
     main()
@@ -1,26 +1,81 @@
+import hashlib
+import json
 import logging
+import os
+import threading
+import orjson
 import yaml
-from typing import Dict, Any, Optional
-from sigma.collection import SigmaCollection
-from sigma.backends.splunk import SplunkBackend
-from sigma.backends.crowdstrike import LogScaleBackend
+from importlib.metadata import version, PackageNotFoundError
+from typing import Dict, Any, List, Optional, IO
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# libyaml's C emitter when PyYAML was built with it
+YAML_DUMPER = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
+
+def read_rule_file(path: str, default: str = "") -> str:
+    """Returns the raw YAML of a Sigma rule file, or `default` if it can't be read."""
+    try:
+        # One binary read and a single decode; rule files are too small for mmap to pay off
+        with open(path, 'rb') as f:
+            return f.read().decode('utf-8')
+    except Exception:
+        return default
+
+def export_json(records: List[Dict[str, Any]]) -> bytes:
+    """Serializes exported queries as indented JSON (orjson emits the bytes directly from C)."""
+    return orjson.dumps(records, option=orjson.OPT_INDENT_2)
+
+def export_yaml(records: List[Dict[str, Any]], stream: Optional[IO[str]] = None) -> Optional[str]:
+    """Serializes exported queries as YAML, keeping each record's field order.
+    
+    Args:
+        records: Export rows.
+        stream: Text stream to write to; if None, the YAML is returned.
+        
+    Returns:
+        Optional[str]: The YAML document when no stream is given.
+    """
+    return yaml.dump(records, stream, Dumper=YAML_DUMPER, sort_keys=False)
+
+# Packages whose versions determine the generated queries, and so key the disk cache
+SIGMA_PACKAGES = ("pysigma", "pysigma-backend-splunk", "pysigma-backend-crowdstrike")
+
+def _package_version(name: str) -> str:
+    """Returns the installed version of a package, or "unknown"."""
+    try:
+        return version(name)
+    except PackageNotFoundError:
+        return "unknown"
+
 class SigmaConverter:
     """Handles conversion of Sigma rules to various target query languages."""
     
-    def __init__(self):
-        """Initialize the converter with backends."""
+    def __init__(self, cache_dir: Optional[str] = None):
+        """Initialize the converter with backends.
+        
+        Args:
+            cache_dir: Optional directory for caching converted queries across runs.
+        """
         try:
+            # pySigma and its backends are slow to import, so that waits for the first converter
+            from sigma.backends.splunk import SplunkBackend
+            from sigma.backends.crowdstrike import LogScaleBackend
             self.splunk_backend = SplunkBackend()
             self.crowdstrike_backend = LogScaleBackend()
             self.backends_available = True
         except Exception as e:
             logger.error(f"Failed to initialize Sigma backends: {e}")
             self.backends_available = False
+        
+        # pySigma backends keep the applied processing pipeline on themselves and reset it on
+        # every convert, so one converter shared by threads (Streamlit sessions, the daemon)
+        # must not run two conversions at once
+        self._lock = threading.Lock()
+        self.cache_dir = cache_dir
+        self._cache_salt = "\0".join(f"{name}={_package_version(name)}" for name in SIGMA_PACKAGES)
 
     def convert(self, rule_yaml: str, target: str) -> str:
         """Convert a raw Sigma YAML string to a target query language.
@@ -36,15 +91,18 @@ class SigmaConverter:
             return "Error: Sigma backends not initialized."
             
         try:
+            from sigma.collection import SigmaCollection
             # Parse the rule
             rules = SigmaCollection.from_yaml(rule_yaml)
             
             if target == 'splunk':
-                queries = self.splunk_backend.convert(rules)
+                backend = self.splunk_backend
             elif target == 'crowdstrike':
-                queries = self.crowdstrike_backend.convert(rules)
+                backend = self.crowdstrike_backend
             else:
                 return f"Error: Unknown target '{target}'"
+            with self._lock:
+                queries = backend.convert(rules)
                 
             # Return the first query (usually one rule = one query)
             if queries:
@@ -68,3 +126,38 @@ class SigmaConverter:
             "splunk": self.convert(rule_yaml, "splunk"),
             "crowdstrike": self.convert(rule_yaml, "crowdstrike")
         }
+
+    def convert_to_all_cached(self, rule_yaml: str) -> Dict[str, str]:
+        """Like convert_to_all(), but reuses results stored in the cache directory.
+        
+        Entries are keyed by a hash of the rule text and the installed pySigma
+        package versions, so upgrading a backend invalidates them.
+        
+        Args:
+            rule_yaml: The raw YAML content of the Sigma rule.
+            
+        Returns:
+            Dict[str, str]: Dictionary mapping target names to generated queries.
+        """
+        if not self.cache_dir or not self.backends_available:
+            return self.convert_to_all(rule_yaml)
+        
+        key = hashlib.blake2b(f"{self._cache_salt}\0{rule_yaml}".encode("utf-8"), digest_size=16).hexdigest()
+        cache_file = os.path.join(self.cache_dir, f"{key}.json")
+        try:
+            with open(cache_file, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            pass
+        
+        queries = self.convert_to_all(rule_yaml)
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            # Write then rename, so concurrent readers never see a partial file
+            tmp_file = f"{cache_file}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                json.dump(queries, f)
+            os.replace(tmp_file, cache_file)
+        except OSError as e:
+            logger.warning(f"Failed to cache converted queries: {e}")
+        return queries
@@ -1,26 +1,100 @@
 import requests
 import pandas as pd
-import json
 import os
 import hashlib
 import warnings
 import logging
+import shutil
 import subprocess
+import sys
 import yaml
-import json
 import time
-from typing import Optional, List, Set, Dict, Any
-from stix2 import MemoryStore, Filter
-
+from collections import defaultdict
+from functools import cached_property
+from typing import Optional, List, Set, Dict, Any, Tuple, Iterator
+import orjson
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 try:
-    from yaml import CLoader as Loader, CDumper as Dumper
+    from . import sigma_parser
 except ImportError:
-    from yaml import Loader, Dumper
+    import sigma_parser
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# List-valued technique columns
+LIST_COLUMNS = ("data_sources", "platforms", "tactics", "threat_actors")
+
+# Bump when the parsed DataFrame's layout changes, so older Parquet caches are ignored
+DATA_CACHE_VERSION = 2
+
+def _mitre_ref(obj: Dict[str, Any]) -> Tuple[Optional[str], str]:
+    """Returns the (external ID, URL) of an object's ATT&CK reference in one scan.
+    
+    Returns (None, "") if the object has no "mitre-attack" reference.
+    """
+    for ref in obj.get("external_references", []):
+        if ref["source_name"] == "mitre-attack":
+            return ref["external_id"], ref.get("url", "")
+    return None, ""
+
+# Seconds to allow a git clone/fetch of the Sigma repository before giving up
+GIT_TIMEOUT = 600
+
+# Below this many rule files, starting worker processes costs more than it saves
+SIGMA_PARALLEL_MIN_FILES = 1000
+# Most worker processes used to parse Sigma rules
+SIGMA_MAX_WORKERS = 8
+
+def _walk_yml(root: str) -> Iterator[str]:
+    """Yields the paths of all .yml files under a directory.
+    
+    Walks with an explicit stack of os.scandir() calls, whose entries carry
+    their file type, so no per-directory name lists or extra stat calls are
+    made. Paths come out in the same order as a top-down os.walk().
+    """
+    stack = [root]
+    while stack:
+        subdirs = []
+        try:
+            with os.scandir(stack.pop()) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        subdirs.append(entry.path)
+                    elif entry.name.endswith(".yml") and entry.is_file():
+                        yield entry.path
+        except OSError:
+            # Unreadable or missing directory; os.walk skips these too
+            continue
+        # Reversed, so subdirectories are popped in scandir order
+        stack.extend(reversed(subdirs))
+
+def _share_rule_strings(technique_to_rules: Dict[str, List[Dict[str, Any]]]) -> Dict[str, List[Dict[str, Any]]]:
+    """Compacts a technique -> rules map in place.
+    
+    A freshly parsed rule is already one dict shared by all of its techniques,
+    but the JSON cache stores it once per technique, so a rule loaded from the
+    cache arrives as separate copies. On both paths each rule's level and tag
+    strings are separate copies of the same few values. This makes each rule
+    a single shared dict and interns those strings.
+    
+    Returns:
+        Dict[str, List[Dict[str, Any]]]: The same map.
+    """
+    shared = {}
+    for rules in technique_to_rules.values():
+        for i, rule in enumerate(rules):
+            first = shared.get(rule["path"])
+            if first is None:
+                if isinstance(rule["level"], str):
+                    rule["level"] = sys.intern(rule["level"])
+                rule["tags"] = [sys.intern(tag) for tag in rule["tags"]]
+                first = shared[rule["path"]] = rule
+            rules[i] = first
+    return technique_to_rules
+
 class MitreLoader:
     """Handles downloading and parsing of MITRE ATT&CK STIX data."""
     
@@ -39,7 +113,16 @@ class MitreLoader:
         self.local_file = os.path.join(self.data_dir, "enterprise-attack.json")
         self.sigma_dir = os.path.join(self.data_dir, "sigma")
         self.sigma_cache_file = os.path.join(self.data_dir, "sigma_cache.json")
+        # Disk cache of Sigma rules converted to each query language (see SigmaConverter)
+        self.sigma_queries_dir = os.path.join(self.data_dir, "sigma_queries")
         self.sigma_repo_url = "https://github.com/SigmaHQ/sigma.git"
+        # Reused across requests so connections are kept alive; transient
+        # connection errors and 5xx responses are retried with backoff
+        self._session = requests.Session()
+        self._session.mount("https://", HTTPAdapter(
+            pool_maxsize=4,
+            max_retries=Retry(total=3, backoff_factor=0.5, status_forcelist=(500, 502, 503, 504)),
+        ))
         
         try:
             os.makedirs(self.data_dir, exist_ok=True)
@@ -61,35 +144,61 @@ class MitreLoader:
 
         logger.info(f"Downloading data from {self.enterprise_attack_url}...")
         try:
-            response = requests.get(self.enterprise_attack_url)
-            response.raise_for_status()
-            
-            with open(self.local_file, 'wb') as f:
-                f.write(response.content)
+            # Stream to disk in 1 MiB chunks (gzip-decoded by requests) rather than
+            # holding the whole bundle in memory, and only replace the old file once complete
+            tmp_file = f"{self.local_file}.part"
+            # Hash while streaming, so the integrity check needn't read the file back
+            sha256_hash = hashlib.sha256()
+            try:
+                with self._session.get(self.enterprise_attack_url, stream=True, timeout=30) as response:
+                    response.raise_for_status()
+                    with open(tmp_file, 'wb') as f:
+                        for chunk in response.iter_content(chunk_size=1 << 20):
+                            f.write(chunk)
+                            sha256_hash.update(chunk)
+                os.replace(tmp_file, self.local_file)
+            except BaseException:
+                # A failed or interrupted download (including a full disk) leaves no partial file
+                try:
+                    os.remove(tmp_file)
+                except OSError:
+                    pass
+                raise
             logger.info("Download complete.")
+            # The new file has a new mtime, so any parsed cache of the old one is stale
+            self._clear_data_cache()
         except requests.RequestException as e:
             logger.error(f"Failed to download data: {e}")
             raise
         
         # Security: Verify data integrity
-        self._verify_data_integrity()
+        self._verify_data_integrity(sha256_hash.hexdigest())
     
-    def _verify_data_integrity(self):
+    def _verify_data_integrity(self, file_hash: Optional[str] = None):
         """Verifies the integrity of downloaded data using SHA256.
         
         Note: This is a basic integrity check. For production use, consider
         verifying against a known-good hash published by MITRE.
+        
+        Args:
+            file_hash: SHA256 hex digest computed while downloading; if omitted,
+                the local file is read and hashed.
         """
         if not os.path.exists(self.local_file):
             return
         
-        sha256_hash = hashlib.sha256()
-        with open(self.local_file, 'rb') as f:
-            # Read in chunks to handle large files
-            for byte_block in iter(lambda: f.read(4096), b""):
-                sha256_hash.update(byte_block)
+        if file_hash is None:
+            with open(self.local_file, 'rb') as f:
+                if hasattr(hashlib, "file_digest"):
+                    # Python 3.11+: the read/update loop runs in C
+                    file_hash = hashlib.file_digest(f, "sha256").hexdigest()
+                else:
+                    sha256_hash = hashlib.sha256()
+                    # Read in chunks to handle large files
+                    for byte_block in iter(lambda: f.read(1 << 16), b""):
+                        sha256_hash.update(byte_block)
+                    file_hash = sha256_hash.hexdigest()
         
-        file_hash = sha256_hash.hexdigest()
         file_size = os.path.getsize(self.local_file)
         
         print(f"[Security] Data integrity check:")
@@ -120,28 +229,125 @@ class MitreLoader:
             
             logger.info("Updating Sigma rules...")
             try:
-                subprocess.run(["git", "-C", self.sigma_dir, "pull"], check=True, capture_output=True)
+                # Only the latest tree is parsed, so fetch just the tip and move to it
+                # rather than pulling history
+                subprocess.run(["git", "-C", self.sigma_dir, "fetch", "--depth", "1", "origin"],
+                               check=True, capture_output=True, text=True, timeout=GIT_TIMEOUT)
+                subprocess.run(["git", "-C", self.sigma_dir, "reset", "--hard", "FETCH_HEAD"],
+                               check=True, capture_output=True, text=True, timeout=GIT_TIMEOUT)
                 logger.info("Sigma rules updated.")
                 return
-            except subprocess.CalledProcessError as e:
+            except (subprocess.CalledProcessError, subprocess.TimeoutExpired) as e:
                 logger.warning(f"Failed to update Sigma rules: {e}. Trying re-clone.")
                 # If pull fails, fall through to re-clone logic (requires clearing dir)
-                import shutil
                 shutil.rmtree(self.sigma_dir, ignore_errors=True)
 
         logger.info(f"Cloning Sigma rules from {self.sigma_repo_url}...")
         try:
-            subprocess.run(["git", "clone", self.sigma_repo_url, self.sigma_dir], check=True, capture_output=True)
+            # Shallow, single-branch clone: the rule history is hundreds of MB and never used
+            subprocess.run(["git", "clone", "--depth", "1", "--single-branch", self.sigma_repo_url, self.sigma_dir],
+                           check=True, capture_output=True, text=True, timeout=GIT_TIMEOUT)
             logger.info("Sigma rules cloned.")
-        except subprocess.CalledProcessError as e:
+        except (subprocess.CalledProcessError, subprocess.TimeoutExpired) as e:
             logger.error(f"Failed to clone Sigma rules: {e}")
             # Don't raise, just log error so app can continue without Sigma
     
+    def _parse_sigma_files(self, rule_files: List[str]) -> List[Optional[Tuple[Dict[str, Any], List[str]]]]:
+        """Parses Sigma rule files, in worker processes when there are enough of them.
+        
+        Args:
+            rule_files: Paths of the rule files to parse.
+            
+        Returns:
+            List: sigma_parser.parse_sigma_file() results, in the same order as `rule_files`.
+        """
+        workers = min(SIGMA_MAX_WORKERS, os.cpu_count() or 1)
+        if len(rule_files) >= SIGMA_PARALLEL_MIN_FILES and workers > 1 and sys.executable:
+            # Parsing is CPU-bound and each file is independent, so each worker takes a
+            # contiguous slice. The workers run sigma_parser as a script: a multiprocessing
+            # pool would re-import this process's main module in every worker (under
+            # Streamlit, the app with pandas and Streamlit itself), and forking would copy
+            # a multi-threaded server
+            size = -(-len(rule_files) // workers)
+            slices = [rule_files[i:i + size] for i in range(0, len(rule_files), size)]
+            procs = []
+            try:
+                for paths in slices:
+                    procs.append(subprocess.Popen([sys.executable, sigma_parser.__file__],
+                                                  stdin=subprocess.PIPE, stdout=subprocess.PIPE))
+                # Each worker reads its whole list before it writes anything, so feeding
+                # them all first can't block on a full output pipe
+                for proc, paths in zip(procs, slices):
+                    with proc.stdin:
+                        proc.stdin.write("\n".join(paths).encode("utf-8"))
+                results = []
+                for proc in procs:
+                    output = proc.stdout.read()
+                    if proc.wait() != 0:
+                        raise OSError(f"worker exited with status {proc.returncode}")
+                    results.extend(orjson.loads(output))
+                return results
+            except (OSError, ValueError) as e:
+                logger.warning(f"Parallel Sigma parsing failed ({e}); parsing serially.")
+            finally:
+                for proc in procs:
+                    if proc.poll() is None:
+                        proc.kill()
+                    proc.stdin.close()
+                    proc.stdout.close()
+                    proc.wait()
+        return [sigma_parser.parse_sigma_file(path) for path in rule_files]
+
+    @cached_property
+    def sigma_rules(self) -> Dict[str, List[Dict[str, Any]]]:
+        """Sigma rules by technique ID, parsed (or loaded from cache) once per loader."""
+        return self.parse_sigma_rules()
+
+    def _clear_sigma_queries(self) -> None:
+        """Deletes the disk cache of converted Sigma queries."""
+        if os.path.exists(self.sigma_queries_dir):
+            try:
+                shutil.rmtree(self.sigma_queries_dir)
+            except OSError as e:
+                logger.warning(f"Failed to clear converted query cache: {e}")
+
+    def _sigma_revision(self) -> Optional[str]:
+        """Returns the commit SHA checked out in the Sigma directory.
+        
+        Reads the git metadata files directly rather than spawning git.
+        
+        Returns:
+            Optional[str]: The HEAD commit SHA, or None if the directory is not a
+            git checkout or HEAD can't be resolved.
+        """
+        git_dir = os.path.join(self.sigma_dir, ".git")
+        try:
+            with open(os.path.join(git_dir, "HEAD"), 'r', encoding='utf-8') as f:
+                head = f.read().strip()
+            if not head.startswith("ref: "):
+                # Detached HEAD holds the SHA itself
+                return head or None
+            ref = head[5:]
+            try:
+                with open(os.path.join(git_dir, *ref.split("/")), 'r', encoding='utf-8') as f:
+                    return f.read().strip() or None
+            except FileNotFoundError:
+                # Fresh clones keep their refs in packed-refs
+                with open(os.path.join(git_dir, "packed-refs"), 'r', encoding='utf-8') as f:
+                    for line in f:
+                        sha, _, name = line.strip().partition(" ")
+                        if name == ref:
+                            return sha
+        except OSError:
+            pass
+        return None
+
     def parse_sigma_rules(self) -> Dict[str, List[Dict[str, Any]]]:
         """Parses Sigma rules and maps them to MITRE Technique IDs.
         
-        Uses a JSON cache to avoid re-parsing thousands of YAML files if the
-        directory hasn't changed.
+        Uses a JSON cache (read and written with orjson) to avoid re-parsing thousands of YAML files.
+        The cache records the Sigma repository's HEAD commit and is used while that is unchanged;
+        for a directory that isn't a git checkout, it is used while newer than the directory.
         
         Returns:
             Dict[str, List[Dict]]: Map of Technique ID (e.g., 'T1003') to list of rule dicts.
@@ -150,94 +356,101 @@ class MitreLoader:
             logger.warning("Sigma rules directory not found. Skipping Sigma parsing.")
             return {}
 
+        revision = self._sigma_revision()
+        
         # Check cache
         if os.path.exists(self.sigma_cache_file):
             try:
-                cache_mtime = os.path.getmtime(self.sigma_cache_file)
-                sigma_mtime = os.path.getmtime(self.sigma_dir)
-                # If cache is newer than the directory modification, use it
-                # Note: git pull updates dir mtime
-                if cache_mtime > sigma_mtime:
-                    logger.info("Loading Sigma rules from cache...")
-                    with open(self.sigma_cache_file, 'r', encoding='utf-8') as f:
-                        return json.load(f)
+                if revision is None:
+                    # If cache is newer than the directory modification, use it
+                    fresh = os.path.getmtime(self.sigma_cache_file) > os.path.getmtime(self.sigma_dir)
+                else:
+                    fresh = True
+                if fresh:
+                    with open(self.sigma_cache_file, 'rb') as f:
+                        cache = orjson.loads(f.read())
+                    # Caches from before the revision was recorded lack "rules" and are reparsed
+                    if "rules" in cache and cache.get("revision") == revision:
+                        logger.info("Loading Sigma rules from cache...")
+                        return _share_rule_strings(cache["rules"])
             except Exception as e:
                 logger.warning(f"Failed to load Sigma cache: {e}. Reparsing.")
 
         logger.info("Parsing Sigma rules (this may take a moment)...")
-        technique_to_rules = {}
+        # The rules changed (or were never indexed), so queries converted from older rule
+        # texts will not be looked up again
+        self._clear_sigma_queries()
+        if not yaml.__with_libyaml__:
+            logger.warning("PyYAML was built without libyaml; Sigma parsing will be about 10x slower. "
+                           "Reinstall PyYAML against libyaml (e.g. libyaml-dev) to speed it up.")
+        technique_to_rules = defaultdict(list)
         rules_dir = os.path.join(self.sigma_dir, "rules")
         
         count = 0
         start_time = time.time()
         
-        for root, _, files in os.walk(rules_dir):
-            for file in files:
-                if file.endswith(".yml"):
-                    try:
-                        file_path = os.path.join(root, file)
-                        with open(file_path, 'r', encoding='utf-8') as f:
-                            # Use CLoader if available for speed
-                            rule = yaml.load(f, Loader=Loader)
-                            
-                        if not rule or 'tags' not in rule:
-                            continue
-                            
-                        # Extract MITRE tags (e.g., attack.t1003)
-                        mitre_tags = [t for t in rule['tags'] if t.startswith('attack.t')]
-                        
-                        if mitre_tags:
-                            rule_data = {
-                                "title": rule.get("title", "Unknown Rule"),
-                                "id": rule.get("id", ""),
-                                "description": rule.get("description", ""),
-                                "level": rule.get("level", "unknown"),
-                                "tags": rule['tags'],
-                                "path": file_path
-                            }
-                            
-                            for tag in mitre_tags:
-                                # Convert attack.t1003 -> T1003
-                                tech_id = tag.split('.')[1].upper()
-                                if tech_id not in technique_to_rules:
-                                    technique_to_rules[tech_id] = []
-                                technique_to_rules[tech_id].append(rule_data)
-                            count += 1
-                            
-                    except Exception as e:
-                        # Skip malformed files
-                        continue
+        rule_files = list(_walk_yml(rules_dir))
+        
+        for parsed in self._parse_sigma_files(rule_files):
+            if parsed is None:
+                continue
+            rule_data, tech_ids = parsed
+            for tech_id in tech_ids:
+                technique_to_rules[tech_id].append(rule_data)
+            count += 1
         
         elapsed = time.time() - start_time
         logger.info(f"Parsed {count} Sigma rules in {elapsed:.2f}s.")
+        # A plain dict, like the one loaded from the cache, so lookups of unknown IDs don't insert
+        technique_to_rules = _share_rule_strings(dict(technique_to_rules))
         
         # Save to cache
         try:
-            with open(self.sigma_cache_file, 'w', encoding='utf-8') as f:
-                json.dump(technique_to_rules, f)
+            with open(self.sigma_cache_file, 'wb') as f:
+                f.write(orjson.dumps({"revision": revision, "rules": technique_to_rules}))
             logger.info("Sigma rules cached.")
         except Exception as e:
             logger.warning(f"Failed to cache Sigma rules: {e}")
             
         return technique_to_rules
 
-    def parse_data(self) -> pd.DataFrame:
-        """Parses the STIX data into a Pandas DataFrame.
+    def _data_cache_path(self) -> str:
+        """Returns the Parquet cache path for the current STIX file, keyed by its mtime."""
+        mtime_ns = os.stat(self.local_file).st_mtime_ns
+        return os.path.join(self.data_dir, f"enterprise-attack.{mtime_ns}.v{DATA_CACHE_VERSION}.parquet")
+
+    def _clear_data_cache(self) -> None:
+        """Deletes all Parquet caches of parsed technique data."""
+        for name in os.listdir(self.data_dir):
+            if name.startswith("enterprise-attack.") and name.endswith(".parquet"):
+                try:
+                    os.remove(os.path.join(self.data_dir, name))
+                except OSError as e:
+                    logger.warning(f"Failed to remove stale cache {name}: {e}")
+
+    def _technique_records(self) -> List[Dict[str, Any]]:
+        """Reads the STIX bundle and flattens each active technique into a record.
         
         Returns:
-            pd.DataFrame: DataFrame containing technique data.
+            List[Dict[str, Any]]: One dict per technique, keyed by DataFrame column.
         """
-        if not os.path.exists(self.local_file):
-            self.download_data()
-
         logger.info("Loading STIX data...")
-        mem = MemoryStore()
-        mem.load_from_file(self.local_file)
+        # orjson parses the bundle in one C call; objects are then bucketed by type in a
+        # single pass, which is all the indexing the lookups below need
+        with open(self.local_file, 'rb') as f:
+            bundle = orjson.loads(f.read())
+        by_type = defaultdict(list)
+        for obj in bundle.get("objects", []):
+            by_type[obj["type"]].append(obj)
 
         # Get all techniques
-        techniques = mem.query([
-            Filter("type", "=", "attack-pattern")
-        ])
+        techniques = by_type["attack-pattern"]
+        
+        # Relationships that target a technique, bucketed by relationship type in one pass
+        rels_to_techniques = defaultdict(list)
+        for r in by_type["relationship"]:
+            if r["target_ref"].startswith("attack-pattern--"):
+                rels_to_techniques[r.get("relationship_type")].append(r)
 
         # ATT&CK v18 Data Source Extraction
         # In v18, the structure is: Technique <- Detection Strategy <- Analytics <- Log Source References
@@ -245,72 +458,55 @@ class MitreLoader:
         # Each log source reference contains: x_mitre_data_component_ref, name, and channel
         
         # Get all Analytics and extract Data Component names from log source references
-        analytics = mem.query([
-            Filter("type", "=", "x-mitre-analytic")
-        ])
+        analytics = by_type["x-mitre-analytic"]
         
-        # Map Analytic ID to set of Data Component names (extracted from log sources)
+        # Data Component names are few (~100), so sets of them are carried as int bitmaps:
+        # each distinct name gets a bit (in sorted order) and merging sets is a single |
+        dc_names_by_bit = sorted({dc["name"] for dc in by_type["x-mitre-data-component"]})
+        name_to_bit = {name: 1 << i for i, name in enumerate(dc_names_by_bit)}
+        # Map Data Component ID to its bit once, instead of a store lookup per log source reference
+        dc_id_to_bit = {dc["id"]: name_to_bit[dc["name"]] for dc in by_type["x-mitre-data-component"]}
+        
+        # Map Analytic ID to bitmap of Data Components (extracted from log sources)
         analytic_to_data_components = {}
         for a in analytics:
-            log_refs = a.get("x_mitre_log_source_references", [])
-            if log_refs:
-                dc_names = set()
-                for log_ref in log_refs:
-                    dc_ref = log_ref.get("x_mitre_data_component_ref")
-                    if dc_ref:
-                        dc = mem.get(dc_ref)
-                        if dc:
-                            dc_names.add(dc["name"])
-                if dc_names:
-                    analytic_to_data_components[a["id"]] = dc_names
+            dc_bits = 0
+            for log_ref in a.get("x_mitre_log_source_references", []):
+                dc_bits |= dc_id_to_bit.get(log_ref.get("x_mitre_data_component_ref"), 0)
+            if dc_bits:
+                analytic_to_data_components[a["id"]] = dc_bits
 
         # Get all detection strategies and map to Data Components via Analytics
-        det_strategies = mem.query([
-            Filter("type", "=", "x-mitre-detection-strategy")
-        ])
-        strat_to_data_components = {}
+        det_strategies = by_type["x-mitre-detection-strategy"]
+        strat_to_data_components = defaultdict(int)
         for ds in det_strategies:
             analytic_refs = ds.get("x_mitre_analytic_refs", [])
             for ref in analytic_refs:
                 if ref in analytic_to_data_components:
-                    if ds["id"] not in strat_to_data_components:
-                        strat_to_data_components[ds["id"]] = set()
-                    strat_to_data_components[ds["id"]].update(analytic_to_data_components[ref])
+                    strat_to_data_components[ds["id"]] |= analytic_to_data_components[ref]
 
         # Get relationships for detection strategies (detects)
-        ds_relationships = mem.query([
-            Filter("type", "=", "relationship"),
-            Filter("relationship_type", "=", "detects")
-        ])
+        ds_relationships = rels_to_techniques["detects"]
 
-        # Map technique ID to list of Data Component names
-        tech_to_data_components = {}
+        # Map technique ID to bitmap of Data Components
+        tech_to_data_components = defaultdict(int)
         for r in ds_relationships:
-            if r["source_ref"] in strat_to_data_components and r["target_ref"].startswith("attack-pattern--"):
-                if r["target_ref"] not in tech_to_data_components:
-                    tech_to_data_components[r["target_ref"]] = set()
-                tech_to_data_components[r["target_ref"]].update(strat_to_data_components[r["source_ref"]])
+            if r["source_ref"] in strat_to_data_components:
+                tech_to_data_components[r["target_ref"]] |= strat_to_data_components[r["source_ref"]]
         
         # Get all intrusion sets (Threat Actors)
-        intrusion_sets = mem.query([
-            Filter("type", "=", "intrusion-set")
-        ])
+        intrusion_sets = by_type["intrusion-set"]
         
         # Create a map of ID to Name for intrusion sets
         intrusion_set_map = {i["id"]: i["name"] for i in intrusion_sets}
 
-        # Get all relationships
-        relationships = mem.query([
-            Filter("type", "=", "relationship"),
-            Filter("relationship_type", "=", "uses")
-        ])
+        # Get "uses" relationships
+        relationships = rels_to_techniques["uses"]
 
         # Map technique ID to list of intrusion set names
-        tech_to_actors = {}
+        tech_to_actors = defaultdict(list)
         for r in relationships:
-            if r["source_ref"] in intrusion_set_map and r["target_ref"].startswith("attack-pattern--"):
-                if r["target_ref"] not in tech_to_actors:
-                    tech_to_actors[r["target_ref"]] = []
+            if r["source_ref"] in intrusion_set_map:
                 tech_to_actors[r["target_ref"]].append(intrusion_set_map[r["source_ref"]])
 
         data = []
@@ -319,17 +515,23 @@ class MitreLoader:
             if t.get("x_mitre_deprecated") or t.get("revoked"):
                 continue
 
-            # Get external ID (e.g., T1003)
-            external_id = next((ref["external_id"] for ref in t.get("external_references", []) if ref["source_name"] == "mitre-attack"), None)
+            # Get external ID (e.g., T1003) and ATT&CK URL
+            external_id, url = _mitre_ref(t)
             
-            # Get Data Components (v18 approach)
-            data_sources = ", ".join(sorted(tech_to_data_components.get(t["id"], set())))
+            # Get Data Components (v18 approach), decoded lowest bit first, i.e. sorted by name
+            data_sources = []
+            dc_bits = tech_to_data_components.get(t["id"], 0)
+            while dc_bits:
+                low_bit = dc_bits & -dc_bits
+                data_sources.append(dc_names_by_bit[low_bit.bit_length() - 1])
+                dc_bits ^= low_bit
             
-            # Get platforms
-            platforms = t.get("x_mitre_platforms", [])
+            # Get platforms (interned: the same few names repeat across techniques; data
+            # source and actor names are already shared objects from the maps above)
+            platforms = [sys.intern(p) for p in t.get("x_mitre_platforms") or []]
             
             # Get tactics
-            tactics = [phase["phase_name"] for phase in t.get("kill_chain_phases", []) if phase["kill_chain_name"] == "mitre-attack"]
+            tactics = [sys.intern(phase["phase_name"]) for phase in t.get("kill_chain_phases", []) if phase["kill_chain_name"] == "mitre-attack"]
 
             # Get threat actors
             threat_actors = tech_to_actors.get(t["id"], [])
@@ -342,11 +544,56 @@ class MitreLoader:
                 "data_sources": data_sources,
                 "platforms": platforms,
                 "tactics": tactics,
-                "threat_actors": sorted(threat_actors),
-                "url": next((ref["url"] for ref in t.get("external_references", []) if ref["source_name"] == "mitre-attack"), "")
+                "threat_actors": threat_actors,
+                "url": url
             })
+        return data
 
-        df = pd.DataFrame(data)
+    def parse_data(self) -> pd.DataFrame:
+        """Parses the STIX data into a Pandas DataFrame.
+        
+        Uses a Parquet cache of the parsed DataFrame, keyed by the STIX file's
+        mtime, to skip the STIX traversal when the file hasn't changed.
+        
+        Returns:
+            pd.DataFrame: DataFrame containing technique data.
+        """
+        if not os.path.exists(self.local_file):
+            self.download_data()
+
+        # Check cache
+        cache_file = self._data_cache_path()
+        if os.path.exists(cache_file):
+            try:
+                logger.info("Loading technique data from cache...")
+                df = pd.read_parquet(cache_file)
+                # Parquet list columns come back as NumPy arrays of fresh strings; restore
+                # plain lists, sharing one string object per distinct value
+                for col in LIST_COLUMNS:
+                    df[col] = [[sys.intern(value) for value in values] for values in df[col]]
+                return df
+            except Exception as e:
+                logger.warning(f"Failed to load technique cache: {e}. Reparsing.")
+
+        # data_sources, platforms, tactics and threat_actors are always lists (possibly
+        # empty), so consumers never need to type-check them
+        # The raw STIX objects live only inside _technique_records(), so they are
+        # released before the DataFrame is built rather than held alongside it
+        df = pd.DataFrame(self._technique_records())
+        # Sort once over the finished column rather than inside the assembly loop
+        # (data_sources come out of their bitmaps already sorted)
+        df["threat_actors"] = df["threat_actors"].map(sorted)
+        # Display strings for the list columns, joined once here instead of on every render
+        for col in LIST_COLUMNS:
+            df[f"{col}_str"] = df[col].str.join(", ")
+        
+        # Save to cache, replacing caches of older STIX files
+        self._clear_data_cache()
+        try:
+            df.to_parquet(cache_file, compression="zstd", index=False)
+            logger.info("Technique data cached.")
+        except Exception as e:
+            logger.warning(f"Failed to cache technique data: {e}")
         return df
 
 if __name__ == "__main__":
@@ -1,5 +1,8 @@
+import numpy as np
 import pandas as pd
-from typing import Optional, List, Set, Dict, Any, Union
+from collections import defaultdict
+from functools import cached_property
+from typing import Optional, List, Set, Dict, Any, Union, Iterable, Callable
 try:
     from .loader import MitreLoader
 except ImportError:
@@ -8,6 +11,60 @@ except ImportError:
 # Security: Limit query results to prevent DoS attacks
 MAX_RESULTS = 1000
 
+def normalize_tactic(tactic: str) -> str:
+    """Normalizes a tactic name to its kill-chain phase form (e.g. "Defense Evasion" -> "defense-evasion")."""
+    return tactic.lower().replace(" ", "-")
+
+def build_inverted_index(values: Iterable[Any], normalize: Callable[[str], str] = str.lower) -> Dict[str, np.ndarray]:
+    """Builds a map of normalized value to the row positions containing it.
+    
+    Args:
+        values: Per-row lists of values (e.g. the 'tactics' column); every row must be a list.
+        normalize: Function applied to each value before it is used as a key.
+        
+    Returns:
+        Dict[str, np.ndarray]: Map of normalized value to sorted row positions.
+    """
+    positions = defaultdict(list)
+    for i, row in enumerate(values):
+        for value in row:
+            if value:
+                positions[normalize(value)].append(i)
+    return {key: np.unique(np.array(rows, dtype=np.int64)) for key, rows in positions.items()}
+
+def explode_normalized(values: pd.Series, normalize: Callable[[str], str] = str.lower) -> pd.Series:
+    """Explodes a list column into a long-format categorical Series.
+    
+    Args:
+        values: Column of per-row lists (e.g. the 'tactics' column).
+        normalize: Function applied to each value before categorical encoding.
+        
+    Returns:
+        pd.Series: One entry per (row, value) pair, indexed by row position.
+    """
+    long = values.reset_index(drop=True).explode().dropna()
+    return long.map(normalize).astype('category')
+
+def match_positions(long: pd.Series, needle: str) -> np.ndarray:
+    """Returns the row positions whose exploded values contain `needle`.
+    
+    The substring test only runs once per distinct category, not once per row.
+    
+    Args:
+        long: Long-format categorical Series from explode_normalized().
+        needle: Normalized substring to look for.
+        
+    Returns:
+        np.ndarray: Sorted, unique row positions.
+    """
+    categories = long.cat.categories
+    matched = categories[categories.str.contains(needle, regex=False)]
+    return np.unique(long.index[long.isin(matched)].to_numpy())
+
+def sorted_unique(values: pd.Series) -> List[str]:
+    """Returns the sorted distinct values of a list column, exploded and deduplicated in C."""
+    return sorted(values.explode().dropna().unique().tolist())
+
 class MitreQuery:
     """Handles querying and filtering of MITRE ATT&CK data."""
     def __init__(self, df: Optional[pd.DataFrame] = None, sigma_rules: Optional[Dict[str, List[Dict[str, Any]]]] = None):
@@ -25,6 +82,129 @@ class MitreQuery:
             
         # Use provided rules or empty dict (lazy load or explicit load required)
         self.sigma_rules = sigma_rules if sigma_rules is not None else {}
+        # Rule count per technique, so display code can use a vectorized Series.map
+        self.sigma_counts = {tech_id: len(rules) for tech_id, rules in self.sigma_rules.items()}
+        # Technique IDs that have at least one Sigma rule
+        self.sigma_ids = frozenset(self.sigma_rules)
+        
+        # The lookup structures below are built on first use, so a one-shot CLI
+        # command only pays for the ones it actually queries
+
+    @cached_property
+    def _tactics_long(self) -> pd.Series:
+        """Long-format (row, tactic) table, normalized once."""
+        return explode_normalized(self.df['tactics'], normalize=normalize_tactic)
+
+    @cached_property
+    def _actors_long(self) -> pd.Series:
+        """Long-format (row, threat actor) table, normalized once."""
+        return explode_normalized(self.df['threat_actors'])
+
+    @cached_property
+    def _datasources_long(self) -> pd.Series:
+        """Long-format (row, data source) table, normalized once."""
+        return explode_normalized(self.df['data_sources'])
+
+    @cached_property
+    def _platforms_long(self) -> pd.Series:
+        """Long-format (row, platform) table, normalized once."""
+        return explode_normalized(self.df['platforms'])
+
+    @cached_property
+    def _value_masks(self) -> Dict[str, Dict[str, np.ndarray]]:
+        """Exact-value row masks for dropdown-style filters: one lookup per filter instead of a scan."""
+        return {
+            'data_sources': self._build_value_masks(build_inverted_index(self.df['data_sources'])),
+            'tactics': self._build_value_masks(build_inverted_index(self.df['tactics'], normalize=normalize_tactic)),
+            'threat_actors': self._build_value_masks(build_inverted_index(self.df['threat_actors'])),
+        }
+
+    @cached_property
+    def _no_rows(self) -> np.ndarray:
+        """Read-only all-False row mask."""
+        no_rows = np.zeros(len(self.df), dtype=bool)
+        no_rows.flags.writeable = False
+        return no_rows
+
+    @cached_property
+    def _sigma_rows(self) -> np.ndarray:
+        """Row mask of techniques with at least one Sigma rule."""
+        return self.df['external_id'].isin(self.sigma_ids).to_numpy()
+
+    @cached_property
+    def _search_blob(self) -> pd.Series:
+        """Lowercased name + NUL + description, so a keyword test is a single vectorized scan.
+        
+        The NUL keeps matches from spanning the two fields; Arrow strings keep the scan in C++.
+        """
+        return (self.df['name'] + '\0' + self.df['description'].fillna('')).astype('string[pyarrow]').str.lower()
+
+    def _build_value_masks(self, index: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+        """Expands an inverted index of row positions into read-only boolean row masks."""
+        masks = {}
+        for key, positions in index.items():
+            mask = np.zeros(len(self.df), dtype=bool)
+            mask[positions] = True
+            mask.flags.writeable = False
+            masks[key] = mask
+        return masks
+
+    def value_mask(self, column: str, value: str) -> np.ndarray:
+        """Returns a boolean row mask of techniques whose `column` contains exactly `value`.
+        
+        Args:
+            column: One of 'data_sources', 'tactics' or 'threat_actors'.
+            value: Value as listed by the matching get_all_*() method (case-insensitive).
+            
+        Returns:
+            np.ndarray: Read-only boolean array aligned with the DataFrame rows.
+        """
+        key = normalize_tactic(value) if column == 'tactics' else value.lower()
+        return self._value_masks[column].get(key, self._no_rows)
+
+    def keyword_mask(self, keyword: str) -> np.ndarray:
+        """Returns a boolean row mask of techniques whose name or description contains `keyword`.
+        
+        The match is a case-insensitive substring test, run as one vectorized scan.
+        
+        Args:
+            keyword: Search term.
+            
+        Returns:
+            np.ndarray: Boolean array aligned with the DataFrame rows.
+        """
+        return self._search_blob.str.contains(keyword.lower(), regex=False, na=False).to_numpy(dtype=bool)
+
+    def filter_mask(self, datasource: Optional[str] = None, tactic: Optional[str] = None,
+                    threat_actor: Optional[str] = None, keyword: Optional[str] = None,
+                    sigma_only: bool = False) -> np.ndarray:
+        """Builds the combined row mask for a set of filters in one call.
+        
+        Dropdown-style filters match exact values; the keyword is a case-insensitive
+        substring of the name or description. Filters left as None are not applied.
+        
+        Args:
+            datasource: Exact data source name.
+            tactic: Exact tactic name.
+            threat_actor: Exact Threat Actor name.
+            keyword: Search term.
+            sigma_only: If True, keep only techniques with at least one Sigma rule.
+            
+        Returns:
+            np.ndarray: Boolean array aligned with the DataFrame rows.
+        """
+        mask = np.ones(len(self.df), dtype=bool)
+        if datasource is not None:
+            mask &= self.value_mask('data_sources', datasource)
+        if tactic is not None:
+            mask &= self.value_mask('tactics', tactic)
+        if threat_actor is not None:
+            mask &= self.value_mask('threat_actors', threat_actor)
+        if keyword:
+            mask &= self.keyword_mask(keyword)
+        if sigma_only:
+            mask &= self._sigma_rows
+        return mask
 
     def search_by_keyword(self, keyword: str, max_results: int = MAX_RESULTS) -> pd.DataFrame:
         """Searches for techniques containing the keyword in name or description.
@@ -36,9 +216,7 @@ class MitreQuery:
         Returns:
             pd.DataFrame: Filtered DataFrame containing matching techniques.
         """
-        keyword = keyword.lower()
-        mask = self.df.apply(lambda x: keyword in x['name'].lower() or keyword in x['description'].lower(), axis=1)
-        results = self.df[mask]
+        results = self.df[self.keyword_mask(keyword)]
         if len(results) > max_results:
             print(f"[Security] Results truncated to {max_results} (found {len(results)})")
             return results.head(max_results)
@@ -55,10 +233,7 @@ class MitreQuery:
             pd.DataFrame: Filtered DataFrame.
         """
         datasource = datasource.lower()
-        # Handle cases where data_sources might be None or empty
-        # data_sources is a comma-separated string
-        mask = self.df['data_sources'].apply(lambda x: datasource in x.lower() if isinstance(x, str) else False)
-        results = self.df[mask]
+        results = self.df.iloc[match_positions(self._datasources_long, datasource)]
         if len(results) > max_results:
             print(f"[Security] Results truncated to {max_results} (found {len(results)})")
             return results.head(max_results)
@@ -73,9 +248,8 @@ class MitreQuery:
         Returns:
             pd.DataFrame: Filtered DataFrame.
         """
-        tactic = tactic.lower().replace(" ", "-")
-        mask = self.df['tactics'].apply(lambda x: any(tactic in t.lower().replace(" ", "-") for t in x) if isinstance(x, list) else False)
-        return self.df[mask]
+        tactic = normalize_tactic(tactic)
+        return self.df.iloc[match_positions(self._tactics_long, tactic)]
 
     def filter_by_platform(self, platform: str) -> pd.DataFrame:
         """Filters techniques by platform.
@@ -87,8 +261,7 @@ class MitreQuery:
             pd.DataFrame: Filtered DataFrame.
         """
         platform = platform.lower()
-        mask = self.df['platforms'].apply(lambda x: any(platform in p.lower() for p in x) if isinstance(x, list) else False)
-        return self.df[mask]
+        return self.df.iloc[match_positions(self._platforms_long, platform)]
 
     def filter_by_threat_actor(self, actor_name: str) -> pd.DataFrame:
         """Filters techniques used by a specific Threat Actor.
@@ -100,8 +273,12 @@ class MitreQuery:
             pd.DataFrame: Filtered DataFrame.
         """
         actor_name = actor_name.lower()
-        mask = self.df['threat_actors'].apply(lambda x: any(actor_name in a.lower() for a in x) if isinstance(x, list) else False)
-        return self.df[mask]
+        return self.df.iloc[match_positions(self._actors_long, actor_name)]
+
+    @cached_property
+    def all_threat_actors(self) -> List[str]:
+        """Sorted list of all unique Threat Actors, computed once per instance."""
+        return sorted_unique(self.df['threat_actors'])
 
     def get_all_threat_actors(self) -> List[str]:
         """Returns a list of all unique Threat Actors.
@@ -109,12 +286,7 @@ class MitreQuery:
         Returns:
             List[str]: Sorted list of threat actor names.
         """
-        all_actors = set()
-        for actors in self.df['threat_actors']:
-            if isinstance(actors, list):
-                for actor in actors:
-                    all_actors.add(actor)
-        return sorted(list(all_actors))
+        return self.all_threat_actors
 
     def get_technique_details(self, technique_id: str) -> Optional[Dict[str, Any]]:
         """Gets details for a specific technique ID (e.g., T1003).
@@ -132,8 +304,7 @@ class MitreQuery:
         
         details = result.iloc[0].to_dict()
         # Add Sigma rules count to details
-        sigma_rules = self.get_sigma_rules_for_technique(technique_id)
-        details['sigma_rules_count'] = len(sigma_rules)
+        details['sigma_rules_count'] = self.sigma_counts.get(technique_id, 0)
         return details
 
     def get_sigma_rules_for_technique(self, technique_id: str) -> List[Dict[str, Any]]:
@@ -149,18 +320,23 @@ class MitreQuery:
         # Sigma tags are usually lower case attack.t1003, but our parser converts to T1003
         return self.sigma_rules.get(technique_id, [])
 
+    @cached_property
+    def all_datasources(self) -> List[str]:
+        """Sorted list of all unique data sources, computed once per instance."""
+        return sorted_unique(self.df['data_sources'])
+
     def get_all_datasources(self) -> List[str]:
         """Returns a list of all unique data sources.
         
         Returns:
             List[str]: Sorted list of data source names.
         """
-        all_sources = set()
-        for sources in self.df['data_sources']:
-            if isinstance(sources, str) and sources:
-                for source in sources.split(", "):
-                    all_sources.add(source)
-        return sorted(list(all_sources))
+        return self.all_datasources
+
+    @cached_property
+    def all_tactics(self) -> List[str]:
+        """Sorted list of all unique tactics, computed once per instance."""
+        return sorted_unique(self.df['tactics'])
 
     def get_all_tactics(self) -> List[str]:
         """Returns a list of all unique tactics.
@@ -168,9 +344,4 @@ class MitreQuery:
         Returns:
             List[str]: Sorted list of tactic names.
         """
-        all_tactics = set()
-        for tactics in self.df['tactics']:
-            if isinstance(tactics, list):
-                for tactic in tactics:
-                    all_tactics.add(tactic)
-        return sorted(list(all_tactics))
+        return self.all_tactics
@@ -0,0 +1,57 @@
+# Parsing of single Sigma rule files. Also run as a script by MitreLoader's parsing
+# workers, so it imports only PyYAML and orjson (not pandas, requests and the rest
+# of src.loader's imports)
+import sys
+import orjson
+import yaml
+from typing import Optional, List, Dict, Any, Tuple
+
+# Sigma rules are untrusted input, so only the safe loaders are used; libyaml's C
+# parser when PyYAML was built with it (the pure-Python one is ~10x slower)
+Loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+def parse_sigma_file(file_path: str) -> Optional[Tuple[Dict[str, Any], List[str]]]:
+    """Parses one Sigma rule file.
+    
+    Args:
+        file_path: Path of the rule's YAML file.
+        
+    Returns:
+        Optional[Tuple[Dict[str, Any], List[str]]]: The rule record and the technique IDs
+        it is tagged with, or None if the file is malformed or has no ATT&CK technique tags.
+    """
+    try:
+        with open(file_path, 'r', encoding='utf-8') as f:
+            # Use CSafeLoader if available for speed
+            rule = yaml.load(f, Loader=Loader)
+            
+        if not rule or 'tags' not in rule:
+            return None
+            
+        # Extract MITRE tags (e.g., attack.t1003)
+        mitre_tags = [t for t in rule['tags'] if t.startswith('attack.t')]
+        if not mitre_tags:
+            return None
+        
+        rule_data = {
+            "title": rule.get("title", "Unknown Rule"),
+            "id": rule.get("id", ""),
+            "description": rule.get("description", ""),
+            "level": rule.get("level", "unknown"),
+            "tags": rule['tags'],
+            "path": file_path
+        }
+        # Convert attack.t1003 -> T1003
+        return rule_data, [tag.split('.')[1].upper() for tag in mitre_tags]
+    except Exception:
+        # Skip malformed files
+        return None
+
+def main() -> None:
+    """Parses the rule files listed on stdin, one path per line, and writes the results to stdout as JSON."""
+    paths = sys.stdin.buffer.read().decode("utf-8").splitlines()
+    # str() covers the odd YAML value JSON has no type for (e.g. dates)
+    sys.stdout.buffer.write(orjson.dumps([parse_sigma_file(path) for path in paths], default=str))
+
+if __name__ == "__main__":
+    main()